@@ -5,14 +5,19 @@ import os
 import openpyxl
 from openpyxl.styles import PatternFill, Font
 from openpyxl.utils import get_column_letter
+from external_sort import TierSpool, write_tier_excel
 
-def analyze_logos(parquet_file):
+def analyze_logos(parquet_file, spool_dir=None):
     """
     Analizează similaritățile între logouri din logos.snappy(2).parquet și generează Excel-uri:
     - Perfect.xlsx: 4+ litere comune
     - Medium.xlsx: 2-3 litere comune
     - Similar.xlsx: 1 literă comună
+
+    Perechile sunt scrise temporar în `spool_dir` (sau $LOGO_SPOOL_DIR); alegeți
+    un director de pe disc, nu tmpfs, pentru corpusuri mari.
     """
+    perfect_matches = medium_matches = similar_matches = None
     try:
         # Verificăm explicit existența fișierului parquet
         if not os.path.exists(parquet_file):
@@ -34,10 +39,10 @@ def analyze_logos(parquet_file):
             print("Eroare: Nu s-au găsit domenii valide pentru analiză")
             return
         
-        # Dicționare pentru diferite nivele de similaritate
-        perfect_matches = []    # 4+ litere comune
-        medium_matches = []     # 2-3 litere comune
-        similar_matches = []    # 1 literă comună
+        # Nivelele de similaritate sunt colectate pe disc, grupate după numărul de litere comune
+        perfect_matches = TierSpool(spool_dir=spool_dir)    # 4+ litere comune
+        medium_matches = TierSpool(spool_dir=spool_dir)     # 2-3 litere comune
+        similar_matches = TierSpool(spool_dir=spool_dir)    # 1 literă comună
         
         # Analizăm fiecare pereche de domenii
         for domain1, domain2 in combinations(domains, 2):
@@ -61,24 +66,13 @@ def analyze_logos(parquet_file):
         def save_to_excel(data, filename):
             if not data:
                 return 0
-                
-            df = pd.DataFrame(data)
-            df = df.sort_values('Număr litere comune', ascending=False)
-            
-            # Folosim mode='w' pentru a suprascrie fișierul dacă există
-            with pd.ExcelWriter(filename, engine='openpyxl', mode='w') as writer:
-                # Salvăm datele principale
-                df.to_excel(writer, sheet_name='Date', index=False)
-                
-                # Adăugăm statistici
-                stats_data = {
-                    'Metric': ['Total perechi', 'Medie litere comune'],
-                    'Valoare': [len(df), round(df['Număr litere comune'].mean(), 2)]
-                }
-                stats_df = pd.DataFrame(stats_data)
-                stats_df.to_excel(writer, sheet_name='Statistici', index=False)
             
-            return len(df)
+            # Sortarea se face pe bucket-uri de pe disc și se scrie în flux
+            stats = [
+                ('Total perechi', len(data)),
+                ('Medie litere comune', round(data.mean(), 2))
+            ]
+            return write_tier_excel(data, filename, 'Date', stats)
 
         # Salvăm rezultatele în fișiere separate
         results = []
@@ -108,6 +102,11 @@ def analyze_logos(parquet_file):
             
     except Exception as e:
         print(f"A apărut o eroare în timpul procesării: {str(e)}")
+    finally:
+        # Ștergem fișierele temporare ale nivelelor
+        for spool in (perfect_matches, medium_matches, similar_matches):
+            if spool is not None:
+                spool.close()
 
 if __name__ == "__main__":
     analyze_logos('logos.snappy(2).parquet')
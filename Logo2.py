@@ -7,15 +7,17 @@ from openpyxl.styles import PatternFill, Font
 from openpyxl.utils import get_column_letter
 from fuzzywuzzy import fuzz, process
 from collections import defaultdict
+from external_sort import TierSpool, write_tier_excel
 
 class LogoAnalyzer:
-    def __init__(self, parquet_file='logos.snappy(2).parquet'):
+    def __init__(self, parquet_file='logos.snappy(2).parquet', spool_dir=None):
         self.parquet_file = parquet_file
+        self.spool_dir = spool_dir  # Director pe disc pentru perechi (implicit $LOGO_SPOOL_DIR)
         self.domains = []
         self.company_names = []
-        self.perfect_matches = []
-        self.medium_matches = []
-        self.similar_matches = []
+        self.perfect_matches = None
+        self.medium_matches = None
+        self.similar_matches = None
         self.similar_companies = defaultdict(list)
         self.SIMILARITY_THRESHOLD = 85
 
@@ -47,6 +49,12 @@ class LogoAnalyzer:
 
     def find_similar_pairs(self):
         """Găsește perechi de domenii cu litere comune."""
+        # Perechile sunt scrise pe disc, grupate după numărul de litere comune
+        self.close_spools()
+        self.perfect_matches = TierSpool(spool_dir=self.spool_dir)
+        self.medium_matches = TierSpool(spool_dir=self.spool_dir)
+        self.similar_matches = TierSpool(spool_dir=self.spool_dir)
+
         for domain1, domain2 in combinations(self.domains, 2):
             common_letters = set(str(domain1).lower()) & set(str(domain2).lower())
             num_common = len(common_letters)
@@ -68,6 +76,13 @@ class LogoAnalyzer:
             elif num_common == 1:
                 self.similar_matches.append(pair_info)
 
+    def close_spools(self):
+        """Șterge fișierele temporare ale nivelelor de similaritate."""
+        for spool in (self.perfect_matches, self.medium_matches, self.similar_matches):
+            if spool is not None:
+                spool.close()
+        self.perfect_matches = self.medium_matches = self.similar_matches = None
+
     def find_similar_companies(self):
         """Găsește companii cu nume similare folosind fuzzy matching."""
         for name in self.company_names:
@@ -79,25 +94,28 @@ class LogoAnalyzer:
 
     def save_to_excel(self, data, filename, sheet_name='Date'):
         """Salvează rezultatele într-un fișier Excel."""
-        if not data:
+        if len(data) == 0:
             return 0
             
+        # Nivelele de similaritate trec prin save_tier_to_excel (sortare pe disc)
         df = pd.DataFrame(data)
-        if 'Număr litere comune' in df.columns:
-            df = df.sort_values('Număr litere comune', ascending=False)
         
         with pd.ExcelWriter(filename, engine='openpyxl', mode='w') as writer:
             df.to_excel(writer, sheet_name=sheet_name, index=False)
-            
-            if 'Număr litere comune' in df.columns:
-                stats_data = {
-                    'Metric': ['Total perechi', 'Medie litere comune'],
-                    'Valoare': [len(df), round(df['Număr litere comune'].mean(), 2)]
-                }
-                pd.DataFrame(stats_data).to_excel(writer, sheet_name='Statistici', index=False)
         
         return len(df)
 
+    def save_tier_to_excel(self, spool, filename):
+        """Salvează un nivel de similaritate în Excel, sortat pe disc și scris în flux."""
+        if not spool:
+            return 0
+
+        stats = [
+            ('Total perechi', len(spool)),
+            ('Medie litere comune', round(spool.mean(), 2))
+        ]
+        return write_tier_excel(spool, filename, 'Date', stats)
+
     def analyze(self):
         """Rulează analiza completă și salvează rezultatele."""
         try:
@@ -117,7 +135,7 @@ class LogoAnalyzer:
                 (self.medium_matches, 'Medium.xlsx'),
                 (self.similar_matches, 'Similar.xlsx')
             ]:
-                count = self.save_to_excel(matches, filename)
+                count = self.save_tier_to_excel(matches, filename)
                 if count > 0:
                     results.append(f"{filename}: {count} perechi")
             
@@ -137,6 +155,8 @@ class LogoAnalyzer:
                 
         except Exception as e:
             print(f"Eroare: {str(e)}")
+        finally:
+            self.close_spools()
 
 if __name__ == "__main__":
     analyzer = LogoAnalyzer()
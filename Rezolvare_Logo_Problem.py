@@ -2,15 +2,19 @@ import pandas as pd
 import numpy as np
 from itertools import combinations
 import os
+import sys
 from fuzzywuzzy import fuzz, process
 from collections import defaultdict
 import openpyxl
 from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
+import pyarrow.parquet as pq
+from sketches import HyperLogLog, CountMinSketch, ReservoirSample, wilson_interval
 
 class LogoAnalyzer:
-    def __init__(self):
+    def __init__(self, approximate=False):
         self.parquet_file = 'logos.snappy(2).parquet'  # Specificăm exact fișierul cu care lucrăm
+        self.approximate = approximate  # Statistici aproximative, într-o singură trecere
         self.df = None
         self.domains = []
         self.company_names = []
@@ -19,7 +23,9 @@ class LogoAnalyzer:
             'name_similarity': defaultdict(list),
             'domain_patterns': defaultdict(list),
             'statistics': {},
-            'parquet_info': {}
+            'parquet_info': {},
+            'top_tlds': [],
+            'top_companies': []
         }
 
     def load_and_clean_data(self):
@@ -68,6 +74,16 @@ class LogoAnalyzer:
         except:
             return None
 
+    def similarity_level(self, num_common):
+        """Returnează nivelul de similaritate pentru un număr de litere comune."""
+        if num_common >= 4:
+            return 'perfect'
+        elif num_common in [2, 3]:
+            return 'medium'
+        elif num_common == 1:
+            return 'basic'
+        return None
+
     def analyze_letter_similarity(self):
         """Analizează similaritatea bazată pe litere comune între domenii."""
         print("\nAnalizăm similaritatea literelor între domenii...")
@@ -88,12 +104,9 @@ class LogoAnalyzer:
                 'Procent similaritate': round(num_common / max(len(domain1), len(domain2)) * 100, 2)
             }
             
-            if num_common >= 4:
-                self.analysis_results['letter_similarity']['perfect'].append(similarity_info)
-            elif num_common in [2, 3]:
-                self.analysis_results['letter_similarity']['medium'].append(similarity_info)
-            elif num_common == 1:
-                self.analysis_results['letter_similarity']['basic'].append(similarity_info)
+            level = self.similarity_level(num_common)
+            if level:
+                self.analysis_results['letter_similarity'][level].append(similarity_info)
         
         print("✓ Analiză similaritate litere completă")
 
@@ -155,6 +168,106 @@ class LogoAnalyzer:
         self.analysis_results['statistics'] = {**parquet_stats, **analysis_stats}
         print("✓ Statistici calculate")
 
+    def calculate_approximate_statistics(self, batch_size=65536, sampled_pairs=5000):
+        """
+        Calculează statistici aproximative într-o singură trecere prin fișierul parquet.
+
+        Grupurile de rânduri sunt citite în loturi de `batch_size`, iar memoria
+        este fixă indiferent de numărul de domenii: HyperLogLog pentru valori
+        distincte și Count-Min pentru top-N (câțiva zeci de KB), plus un eșantion
+        de 2 * `sampled_pairs` domenii. Eșantionul este împărțit în perechi
+        disjuncte, independente, pentru intervalele de încredere ale nivelelor.
+        """
+        print(f"\nCalculăm statistici aproximative din {self.parquet_file}...")
+
+        if not os.path.exists(self.parquet_file):
+            raise FileNotFoundError(f"EROARE: Nu s-a găsit fișierul {self.parquet_file}")
+
+        parquet = pq.ParquetFile(self.parquet_file)
+        domain_column = parquet.schema_arrow.names[0]
+
+        self.analysis_results['parquet_info'] = {
+            'Număr total înregistrări': parquet.metadata.num_rows,
+            'Coloane disponibile': parquet.schema_arrow.names,
+            'Dimensiune fișier (bytes)': os.path.getsize(self.parquet_file),
+            'Grupuri de rânduri': parquet.num_row_groups
+        }
+
+        company_hll, tld_hll = HyperLogLog(), HyperLogLog()
+        company_cms, tld_cms = CountMinSketch(), CountMinSketch()
+        domain_sample = ReservoirSample(size=2 * sampled_pairs)
+        total_domains = 0
+
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=[domain_column]):
+            domains = batch.column(0).to_pandas().dropna().astype(str)
+            if domains.empty:
+                continue
+            total_domains += len(domains)
+
+            # Aceeași regulă ca extract_company_name, dar vectorizată pe tot lotul
+            parts = domains.str.lower().str.split('.')
+            companies = parts.str.get(-3).where(parts.str.len() > 2, parts.str.get(0))
+            company_counts = companies[companies != ''].value_counts()
+            tld_counts = domains.str.rsplit('.', n=1).str.get(-1).value_counts()
+
+            # Schițele sunt actualizate o dată per lot, cu valorile deja agregate
+            company_hll.add_batch(company_counts.index)
+            company_cms.add_batch(company_counts.index, company_counts.to_numpy())
+            tld_hll.add_batch(tld_counts.index)
+            tld_cms.add_batch(tld_counts.index, tld_counts.to_numpy())
+
+            domain_sample.extend(domains.to_numpy())
+
+        if total_domains == 0:
+            raise ValueError("EROARE: Fișierul parquet nu conține date")
+
+        # Estimăm proporția fiecărui nivel din perechi disjuncte (independente)
+        pairs = domain_sample.disjoint_pairs()
+        level_counts = defaultdict(int)
+        for domain1, domain2 in pairs:
+            level = self.similarity_level(len(set(domain1.lower()) & set(domain2.lower())))
+            if level:
+                level_counts[level] += 1
+
+        total_pairs = total_domains * (total_domains - 1) // 2
+        analysis_stats = {
+            'Total domenii': total_domains,
+            'Total companii unice (aprox.)': company_hll.count(),
+            'TLD-uri unice (aprox.)': tld_hll.count(),
+            'Perechi eșantionate': len(pairs)
+        }
+        for level, label in [
+            ('perfect', 'Perechi perfecte (4+ litere)'),
+            ('medium', 'Perechi medii (2-3 litere)'),
+            ('basic', 'Perechi basic (1 literă)')
+        ]:
+            low, high = wilson_interval(level_counts[level], len(pairs))
+            proportion = level_counts[level] / len(pairs) if pairs else 0
+            analysis_stats[f'{label} (estimat)'] = round(proportion * total_pairs)
+            analysis_stats[f'{label} (interval 95%)'] = f"{round(low * total_pairs)} - {round(high * total_pairs)}"
+
+        self.analysis_results['statistics'] = {**self.analysis_results['parquet_info'], **analysis_stats}
+        self.analysis_results['top_tlds'] = tld_cms.most_common()
+        self.analysis_results['top_companies'] = company_cms.most_common()
+        print("✓ Statistici aproximative calculate")
+
+    def save_approximate_results(self):
+        """Salvează statisticile aproximative și top-N într-un fișier Excel."""
+        print("\nSalvăm statisticile aproximative...")
+
+        output_dir = "Rezultate_Analiza_Logo"
+        os.makedirs(output_dir, exist_ok=True)
+
+        filename = os.path.join(output_dir, 'Statistici_Aproximative.xlsx')
+        with pd.ExcelWriter(filename, engine='openpyxl', mode='w') as writer:
+            pd.DataFrame(list(self.analysis_results['statistics'].items()),
+                         columns=['Metric', 'Valoare']).to_excel(writer, sheet_name='Statistici', index=False)
+            pd.DataFrame(self.analysis_results['top_tlds'],
+                         columns=['TLD', 'Frecvență (aprox.)']).to_excel(writer, sheet_name='Top TLD', index=False)
+            pd.DataFrame(self.analysis_results['top_companies'],
+                         columns=['Companie', 'Frecvență (aprox.)']).to_excel(writer, sheet_name='Top companii', index=False)
+        print(f"✓ Salvat {filename}")
+
     def save_results(self):
         """Salvează rezultatele analizei în fișiere Excel."""
         print("\nSalvăm rezultatele analizei...")
@@ -196,17 +309,22 @@ class LogoAnalyzer:
         try:
             print("=== Începem analiza logo-urilor din logos.snappy(2).parquet ===")
             
-            # Încărcăm și curățăm datele
-            self.load_and_clean_data()
-            
-            # Rulăm toate analizele
-            self.analyze_letter_similarity()
-            self.analyze_name_similarity()
-            self.analyze_domain_patterns()
-            self.calculate_statistics()
-            
-            # Salvăm rezultatele
-            self.save_results()
+            if self.approximate:
+                # O singură trecere prin parquet, cu memorie fixă
+                self.calculate_approximate_statistics()
+                self.save_approximate_results()
+            else:
+                # Încărcăm și curățăm datele
+                self.load_and_clean_data()
+                
+                # Rulăm toate analizele
+                self.analyze_letter_similarity()
+                self.analyze_name_similarity()
+                self.analyze_domain_patterns()
+                self.calculate_statistics()
+                
+                # Salvăm rezultatele
+                self.save_results()
             
             # Afișăm statisticile finale
             print("\n=== Statistici finale ===")
@@ -220,5 +338,6 @@ class LogoAnalyzer:
             print(f"\nEROARE în timpul analizei: {str(e)}")
 
 if __name__ == "__main__":
-    analyzer = LogoAnalyzer()
+    # Rulați cu --aproximativ pentru statistici aproximative pe fișiere foarte mari
+    analyzer = LogoAnalyzer(approximate='--aproximativ' in sys.argv)
     analyzer.run_analysis() 
\ No newline at end of file
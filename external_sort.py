@@ -0,0 +1,138 @@
+import csv
+import os
+import shutil
+import tempfile
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+# Numărul maxim de rânduri de date pe o foaie Excel (1.048.576 minus antetul)
+MAX_ROWS_PER_SHEET = 1048575
+
+# Directorul implicit pentru fișierele temporare ale nivelelor. Pe multe sisteme
+# Linux directorul temporar standard (/tmp) este tmpfs, adică stă în RAM; setați
+# LOGO_SPOOL_DIR (sau parametrul spool_dir) către un director de pe disc.
+SPOOL_DIR_ENV = 'LOGO_SPOOL_DIR'
+
+PAIR_COLUMNS = ['Domeniu 1', 'Domeniu 2', 'Litere comune', 'Număr litere comune']
+
+
+class TierSpool:
+    """
+    Colectează perechile unui nivel de similaritate pe disc, nu în memorie.
+
+    Numărul de litere comune are un domeniu mic de valori întregi, așa că în loc
+    de sortarea externă clasică (run-uri sortate + interclasare k-way) scriem
+    fiecare pereche direct în fișierul bucket-ului ei. Parcurgerea bucket-urilor
+    în ordinea cheii dă rezultatul sortat, cu memorie fixă indiferent de corpus.
+
+    Fișierele sunt create în `spool_dir`; dacă lipsește, în $LOGO_SPOOL_DIR,
+    iar în ultimă instanță în directorul temporar al sistemului.
+    """
+
+    def __init__(self, columns=PAIR_COLUMNS, key='Număr litere comune', spool_dir=None):
+        self.columns = list(columns)
+        self.key = key
+        self._key_index = self.columns.index(key)
+        if spool_dir is None:
+            spool_dir = os.environ.get(SPOOL_DIR_ENV) or None
+        self._dir = tempfile.mkdtemp(prefix='tier_', dir=spool_dir)
+        self._buckets = {}  # valoare cheie -> (fișier, csv.writer)
+        self.count = 0
+        self.total = 0
+        self.max = None
+
+    def append(self, row):
+        """Adaugă o pereche (dicționar cu coloanele din `columns`) în bucket-ul ei."""
+        value = int(row[self.key])
+        if value not in self._buckets:
+            path = os.path.join(self._dir, f'{value}.csv')
+            handle = open(path, 'w', newline='', encoding='utf-8')
+            self._buckets[value] = (handle, csv.writer(handle))
+        self._buckets[value][1].writerow([row[col] for col in self.columns])
+
+        self.count += 1
+        self.total += value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def __len__(self):
+        return self.count
+
+    def mean(self):
+        """Media valorilor cheii, calculată incremental."""
+        return self.total / self.count if self.count else 0
+
+    def iter_sorted(self, descending=True):
+        """Returnează rândurile (liste) în ordinea cheii, citind bucket-urile pe rând."""
+        for handle, _ in self._buckets.values():
+            handle.flush()
+
+        for value in sorted(self._buckets, reverse=descending):
+            path = os.path.join(self._dir, f'{value}.csv')
+            with open(path, newline='', encoding='utf-8') as handle:
+                for row in csv.reader(handle):
+                    row[self._key_index] = value
+                    yield row
+
+    def close(self):
+        """Închide fișierele temporare și șterge directorul de lucru."""
+        for handle, _ in self._buckets.values():
+            handle.close()
+        self._buckets = {}
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _header_row(sheet, columns):
+    # Același stil de antet ca DataFrame.to_excel din pandas
+    thin = Side(style='thin')
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(sheet, value=column)
+        cell.font = Font(bold=True)
+        cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        cell.alignment = Alignment(horizontal='center', vertical='top')
+        header.append(cell)
+    return header
+
+
+def write_tier_excel(spool, filename, sheet_name, stats, descending=True):
+    """
+    Scrie un nivel de similaritate în Excel în flux, fără a-l încărca în memorie.
+
+    Rândurile sortate din `spool` sunt trimise direct unui Workbook write-only;
+    dacă depășesc limita unei foi, continuă pe foi numerotate ('Date 2', ...).
+    `stats` este o listă de perechi (metric, valoare) pentru foaia 'Statistici'.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_index = 0
+    rows_in_sheet = MAX_ROWS_PER_SHEET
+
+    for row in spool.iter_sorted(descending=descending):
+        if rows_in_sheet >= MAX_ROWS_PER_SHEET:
+            sheet_index += 1
+            title = sheet_name if sheet_index == 1 else f'{sheet_name} {sheet_index}'
+            sheet = workbook.create_sheet(title=title[:31])
+            sheet.append(_header_row(sheet, spool.columns))
+            rows_in_sheet = 0
+        sheet.append(row)
+        rows_in_sheet += 1
+
+    if sheet is None:
+        sheet = workbook.create_sheet(title=sheet_name[:31])
+        sheet.append(_header_row(sheet, spool.columns))
+
+    stats_sheet = workbook.create_sheet(title='Statistici')
+    stats_sheet.append(_header_row(stats_sheet, ['Metric', 'Valoare']))
+    for metric, value in stats:
+        stats_sheet.append([metric, value])
+
+    workbook.save(filename)
+    return len(spool)
@@ -5,9 +5,13 @@ from itertools import combinations
 import openpyxl
 from openpyxl.styles import PatternFill, Font, Alignment
 import os
+from external_sort import TierSpool, write_tier_excel
 
 class LogoSimilarityAnalyzer:
-    def __init__(self, parquet_file):
+    def __init__(self, parquet_file, spool_dir=None):
+        # Director pe disc pentru perechi (implicit $LOGO_SPOOL_DIR)
+        self.spool_dir = spool_dir
+        
         if not os.path.exists(parquet_file):
             raise FileNotFoundError(f"Fișierul {parquet_file} nu a fost găsit!")
             
@@ -39,39 +43,51 @@ class LogoSimilarityAnalyzer:
         return domains
 
     def analyze_similarity_levels(self):
-        """Analizează și grupează domeniile pe nivele de similaritate"""
+        """
+        Analizează și grupează domeniile pe nivele de similaritate.
+
+        Returnează trei obiecte TierSpool (maxim, mediu, minim), nu liste de
+        dicționare; apelantul trebuie să le închidă cu close() pentru a șterge
+        fișierele temporare de pe disc.
+        """
         print("\nÎncepe analiza similarității...")
         domains = self.extract_domains()
         
         if not domains:
             raise ValueError("Nu s-au găsit domenii pentru analiză!")
         
-        # Dicționare pentru fiecare nivel de similaritate
-        max_similarity = []     # 4+ litere comune
-        medium_similarity = []  # 2-3 litere comune
-        basic_similarity = []   # 1 literă comună
-        
         total_combinations = sum(1 for _ in combinations(domains, 2))
         print(f"\nAnalizăm {total_combinations} combinații posibile de domenii...")
         
-        # Analizăm toate perechile posibile
-        for domain1, domain2 in combinations(domains, 2):
-            common_letters = self.get_common_letters(domain1, domain2)
-            num_common = len(common_letters)
+        # Nivelele de similaritate sunt colectate pe disc, grupate după numărul de litere comune
+        max_similarity = TierSpool(spool_dir=self.spool_dir)     # 4+ litere comune
+        medium_similarity = TierSpool(spool_dir=self.spool_dir)  # 2-3 litere comune
+        basic_similarity = TierSpool(spool_dir=self.spool_dir)   # 1 literă comună
+        
+        try:
+            # Analizăm toate perechile posibile
+            for domain1, domain2 in combinations(domains, 2):
+                common_letters = self.get_common_letters(domain1, domain2)
+                num_common = len(common_letters)
             
-            similarity_data = {
-                'Domeniu 1': domain1,
-                'Domeniu 2': domain2,
-                'Litere comune': ', '.join(sorted(common_letters)),
-                'Număr litere comune': num_common
-            }
+                similarity_data = {
+                    'Domeniu 1': domain1,
+                    'Domeniu 2': domain2,
+                    'Litere comune': ', '.join(sorted(common_letters)),
+                    'Număr litere comune': num_common
+                }
             
-            if num_common >= 4:
-                max_similarity.append(similarity_data)
-            elif num_common in [2, 3]:
-                medium_similarity.append(similarity_data)
-            elif num_common == 1:
-                basic_similarity.append(similarity_data)
+                if num_common >= 4:
+                    max_similarity.append(similarity_data)
+                elif num_common in [2, 3]:
+                    medium_similarity.append(similarity_data)
+                elif num_common == 1:
+                    basic_similarity.append(similarity_data)
+        except BaseException:
+            # Nu lăsăm fișiere temporare pe disc dacă analiza se întrerupe
+            for spool in (max_similarity, medium_similarity, basic_similarity):
+                spool.close()
+            raise
         
         print("\nRezultate preliminare:")
         print(f"- Similaritate maximă (4+ litere): {len(max_similarity)} perechi")
@@ -82,67 +98,50 @@ class LogoSimilarityAnalyzer:
 
     def export_similarity_analysis(self):
         """Exportă analizele în trei fișiere Excel separate"""
+        max_pairs = medium_pairs = basic_pairs = None
         try:
             max_pairs, medium_pairs, basic_pairs = self.analyze_similarity_levels()
             
             print("\nExportăm rezultatele în fișiere Excel...")
             
+            # Nivelele sunt sortate pe bucket-uri de pe disc și scrise în flux,
+            # astfel încât memoria nu depinde de numărul de perechi
+            
             # 1. Max Similarity (4+ litere comune)
             if max_pairs:
-                df_max = pd.DataFrame(max_pairs)
-                df_max = df_max.sort_values('Număr litere comune', ascending=False)
-                
-                with pd.ExcelWriter('Max_SimilarityLogos.xlsx', engine='openpyxl') as writer:
-                    df_max.to_excel(writer, sheet_name='Similaritate Maximă', index=False)
-                    
-                    stats = pd.DataFrame({
-                        'Metric': ['Total perechi', 'Medie litere comune', 'Maxim litere comune'],
-                        'Valoare': [
-                            len(df_max),
-                            round(df_max['Număr litere comune'].mean(), 2),
-                            df_max['Număr litere comune'].max()
-                        ]
-                    })
-                    stats.to_excel(writer, sheet_name='Statistici', index=False)
-                print(f"✓ Max_SimilarityLogos.xlsx creat cu {len(df_max)} perechi")
+                stats = [
+                    ('Total perechi', len(max_pairs)),
+                    ('Medie litere comune', round(max_pairs.mean(), 2)),
+                    ('Maxim litere comune', max_pairs.max)
+                ]
+                write_tier_excel(max_pairs, 'Max_SimilarityLogos.xlsx', 'Similaritate Maximă', stats)
+                print(f"✓ Max_SimilarityLogos.xlsx creat cu {len(max_pairs)} perechi")
             
             # 2. Medium Similarity (2-3 litere comune)
             if medium_pairs:
-                df_medium = pd.DataFrame(medium_pairs)
-                df_medium = df_medium.sort_values('Număr litere comune', ascending=False)
-                
-                with pd.ExcelWriter('Medium_SimilarityLogos.xlsx', engine='openpyxl') as writer:
-                    df_medium.to_excel(writer, sheet_name='Similaritate Medie', index=False)
-                    
-                    stats = pd.DataFrame({
-                        'Metric': ['Total perechi', 'Medie litere comune'],
-                        'Valoare': [
-                            len(df_medium),
-                            round(df_medium['Număr litere comune'].mean(), 2)
-                        ]
-                    })
-                    stats.to_excel(writer, sheet_name='Statistici', index=False)
-                print(f"✓ Medium_SimilarityLogos.xlsx creat cu {len(df_medium)} perechi")
+                stats = [
+                    ('Total perechi', len(medium_pairs)),
+                    ('Medie litere comune', round(medium_pairs.mean(), 2))
+                ]
+                write_tier_excel(medium_pairs, 'Medium_SimilarityLogos.xlsx', 'Similaritate Medie', stats)
+                print(f"✓ Medium_SimilarityLogos.xlsx creat cu {len(medium_pairs)} perechi")
             
             # 3. Basic Similarity (1 literă comună)
             if basic_pairs:
-                df_basic = pd.DataFrame(basic_pairs)
-                
-                with pd.ExcelWriter('Basic_SimilarityLogos.xlsx', engine='openpyxl') as writer:
-                    df_basic.to_excel(writer, sheet_name='Similaritate Minimă', index=False)
-                    
-                    stats = pd.DataFrame({
-                        'Metric': ['Total perechi'],
-                        'Valoare': [len(df_basic)]
-                    })
-                    stats.to_excel(writer, sheet_name='Statistici', index=False)
-                print(f"✓ Basic_SimilarityLogos.xlsx creat cu {len(df_basic)} perechi")
+                stats = [('Total perechi', len(basic_pairs))]
+                write_tier_excel(basic_pairs, 'Basic_SimilarityLogos.xlsx', 'Similaritate Minimă', stats)
+                print(f"✓ Basic_SimilarityLogos.xlsx creat cu {len(basic_pairs)} perechi")
             
             print("\nAnaliza completă! Fișierele au fost create cu succes.")
             
         except Exception as e:
             print(f"\nEroare în timpul analizei: {str(e)}")
             raise
+        finally:
+            # Ștergem fișierele temporare ale nivelelor
+            for spool in (max_pairs, medium_pairs, basic_pairs):
+                if spool is not None:
+                    spool.close()
 
 # Exemplu de utilizare
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+import math
+import random
+import numpy as np
+import pandas as pd
+
+
+def hash64_array(items):
+    """Hash stabil pe 64 de biți pentru un lot întreg (vectorizat, SipHash din pandas)."""
+    return pd.util.hash_array(np.asarray(items, dtype=object))
+
+
+class HyperLogLog:
+    """
+    Estimează numărul de elemente distincte cu memorie fixă.
+
+    Cu precision=12 folosim 4096 de registre de un octet (4 KB); eroarea
+    standard relativă este aproximativ 1.04 / sqrt(2^precision), adică ~1.6%.
+    """
+
+    def __init__(self, precision=12):
+        # Rangul se calculează prin float64, exact doar pentru cel mult 53 de biți
+        if not 11 <= precision <= 18:
+            raise ValueError("Precizia HyperLogLog trebuie să fie între 11 și 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+        self.alpha = 0.7213 / (1 + 1.079 / self.m)
+
+    def add(self, item):
+        self.add_batch([item])
+
+    def add_batch(self, items):
+        """Adaugă un lot de elemente, actualizând registrele vectorizat."""
+        hashes = hash64_array(items)
+        if len(hashes) == 0:
+            return
+        bits = np.uint64(64 - self.precision)
+        index = (hashes >> bits).astype(np.intp)
+        rest = hashes & ((np.uint64(1) << bits) - np.uint64(1))
+        # frexp întoarce exponentul e cu rest = m * 2^e, 0.5 <= m < 1, adică bit_length
+        bit_length = np.frexp(rest.astype(np.float64))[1]
+        rank = (int(bits) - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self):
+        estimate = self.alpha * self.m * self.m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Corecție pentru cardinalități mici (linear counting)
+        if estimate <= 2.5 * self.m and zeros > 0:
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+
+class CountMinSketch:
+    """
+    Estimează frecvențele elementelor cu memorie fixă și păstrează top-N.
+
+    Estimările nu sunt niciodată sub valoarea reală; supraestimarea este cel
+    mult e/width din totalul adăugat, cu probabilitate 1 - e^-depth.
+    """
+
+    def __init__(self, width=2048, depth=4, top_n=10):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.top_n = top_n
+        self._top = {}  # candidații pentru top-N -> frecvența estimată
+
+    def _columns(self, hashes):
+        """Coloanele (depth x n) pentru fiecare hash, prin dublă hash-uire."""
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = hashes >> np.uint64(32)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((h1[None, :] + rows * h2[None, :]) % np.uint64(self.width)).astype(np.intp)
+
+    def _estimates(self, columns):
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def add(self, item, count=1):
+        self.add_batch([item], [count])
+
+    def add_batch(self, items, counts):
+        """Adaugă un lot de elemente cu frecvențele lor (de ex. rezultatul value_counts)."""
+        items = np.asarray(items, dtype=object)
+        if len(items) == 0:
+            return
+        counts = np.asarray(counts, dtype=np.int64)
+        columns = self._columns(hash64_array(items))
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], counts)
+
+        # Candidații din lot: doar cele mai mari top_n estimări, plus top-ul existent
+        estimates = self._estimates(columns)
+        if len(items) > self.top_n:
+            best = np.argpartition(estimates, -self.top_n)[-self.top_n:]
+            items, estimates = items[best], estimates[best]
+        candidates = dict(zip(items.tolist(), estimates.tolist()))
+        for item in self._top:
+            if item not in candidates:
+                candidates[item] = self.estimate(item)
+        ranked = sorted(candidates.items(), key=lambda pair: pair[1], reverse=True)
+        self._top = dict(ranked[:self.top_n])
+
+    def estimate(self, item):
+        return int(self._estimates(self._columns(hash64_array([item])))[0])
+
+    def most_common(self):
+        """Returnează top-N ca listă de perechi (element, frecvență estimată)."""
+        return sorted(self._top.items(), key=lambda pair: pair[1], reverse=True)
+
+
+class ReservoirSample:
+    """
+    Eșantion uniform de dimensiune fixă dintr-un flux (Algoritmul L).
+
+    După umplerea rezervorului, pozițiile următoare de înlocuire sunt sărite
+    geometric, deci costul pe element ignorat este doar un increment de index.
+    """
+
+    def __init__(self, size=2000, seed=None):
+        self.size = size
+        self.items = []
+        self.seen = 0
+        self._rng = random.Random(seed)
+        self._w = 1.0
+        self._next = None  # poziția absolută din flux a următoarei înlocuiri
+
+    def _uniform(self):
+        u = self._rng.random()
+        while u == 0.0:
+            u = self._rng.random()
+        return u
+
+    def _advance(self, position):
+        """Stabilește următoarea poziție din flux care intră în rezervor."""
+        self._w *= math.exp(math.log(self._uniform()) / self.size)
+        skip = math.floor(math.log(self._uniform()) / math.log(1 - self._w))
+        self._next = position + skip + 1
+
+    def extend(self, batch):
+        """Adaugă un lot de elemente din flux."""
+        batch_start = self.seen
+        if len(self.items) < self.size:
+            take = batch[:self.size - len(self.items)]
+            self.items.extend(take)
+            if len(self.items) == self.size:
+                self._advance(batch_start + len(take) - 1)
+
+        batch_end = batch_start + len(batch)
+        while self._next is not None and self._next < batch_end:
+            self.items[self._rng.randrange(self.size)] = batch[self._next - batch_start]
+            self._advance(self._next)
+        self.seen = batch_end
+
+    def disjoint_pairs(self):
+        """
+        Împerechează elementele eșantionului fără ca un element să apară de două ori.
+
+        Perechile disjuncte dintr-un eșantion uniform sunt (aproape) independente,
+        deci pot fi tratate ca încercări separate într-un interval de încredere.
+        Amestecăm întâi, pentru că la umplere ordinea din rezervor este cea din flux.
+        """
+        items = list(self.items)
+        self._rng.shuffle(items)
+        return list(zip(items[0::2], items[1::2]))
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """
+    Intervalul de încredere Wilson pentru o proporție (implicit 95%).
+
+    Presupune încercări independente; perechile trebuie să nu aibă domenii comune.
+    """
+    if trials == 0:
+        return 0.0, 0.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)